@@ -4,15 +4,13 @@ from utils.style import setup_page
 # Set page config for the main page
 setup_page(
     title="Causal Buddy",
-    icon="🔬"
+    icon="🔬",
+    center_header=True
 )
 
 # Main homepage content
-st.markdown("<h1 style='text-align:center;'>Causal Buddy</h1>", unsafe_allow_html=True)
-st.markdown("<h4 style='text-align:center; color: #666666;'>Tools that make learning causal inference easy</h4>", unsafe_allow_html=True)
-
-st.write("")
-st.write("")
+st.title("Causal Buddy")
+st.caption("Tools that make learning causal inference easy")
 
 # Create columns: left (narrow), right (wide)
 col1, col2, col3 = st.columns([1, 1, 1])
@@ -23,15 +21,13 @@ with col1:
         st.markdown("Learn and Simulate a 2x2 DiD design")
         st.write("")
         did_col1, did_col2 = st.columns(2)
+        # Page links navigate client-side, so clicking one does not rerun this page first
         with did_col1:
-            if st.button("Simulation Tool", type="primary", use_container_width=True):
-                st.switch_page("pages/DiD_Simulation_Tool.py")
+            st.page_link("pages/DiD_Simulation_Tool.py", label="Simulation Tool", use_container_width=True)
         with did_col2:
-            if st.button("Learn DiD", type="primary", use_container_width=True):
-                st.switch_page("pages/DiD_Guide.py")
+            st.page_link("pages/DiD_Guide.py", label="Learn DiD", use_container_width=True)
 with col2:
     with st.container(border=True):
         st.markdown('#### 🧪 A/B Testing Tool')
         st.markdown("Learn how to setup and analyze A/B tests and about sample ratio mismatch (SRM)")
-        if st.button("A/B Testing Guide", type = "primary", use_container_width = True):
-            st.switch_page("pages/AB_Testing_Simulation_Tool.py")
\ No newline at end of file
+        st.page_link("pages/AB_Testing_Simulation_Tool.py", label="A/B Testing Guide", use_container_width=True)
\ No newline at end of file
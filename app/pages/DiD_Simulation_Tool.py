@@ -1,11 +1,24 @@
 import streamlit as st
+import io
 import sys
-import os
+from typing import NamedTuple
+from pathlib import Path
+
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+
+
+# Add the parent directory to the Python path once per server process
+# instead of on every rerun of this script. The membership check keeps it
+# idempotent if the resource cache is cleared or another page already added it
+@st.cache_resource(show_spinner=False)
+def _add_project_root_to_path():
+    project_root = str(Path(__file__).resolve().parents[2])
+    if project_root not in sys.path:
+        sys.path.append(project_root)
 
-# Add the parent directory to the Python path
-sys.path.append(
-    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-)
+
+_add_project_root_to_path()
 
 from methods.diff_in_diff import (
     simulate,
@@ -14,311 +27,580 @@ from methods.diff_in_diff import (
     mean_outcomes_plot,
     means_plot,
     bias_visualization,
+    monte_carlo_did,
+    sampling_distribution_plot,
 )
 from app.utils.style import setup_page
 
-# Set page config for this specific page
-setup_page(title="DiD Simulation Tool", icon="📈")
 
-# Back button with primary styling
-if st.button("← Back to Home", type="primary"):
-    st.switch_page("Home.py")
+# Columns shown in the data preview and included in the CSV download
+DISPLAY_COLUMNS = ["unit", "treat", "time_period", "outcome"]
 
-st.title("Difference-in-Difference Simulation Tool 📈")
 
-# Introduction
-st.write("""Have you ever wanted to measure the impact of a policy or marketing campaign, but for some reason you couldn't run a 
-         traditional A/B test or randomized experiment? Or maybe you already launched the policy and need to understand the effects 
-         using observational data.""")
-st.write("""The difference-in-difference design might be a good candidate for you to measure the impact of this policy. If this method is completely new to you, check out the DiD guide tab before using this tool. 
-         If you are already familiar with this method, feel free to skip over and start messing around with the simulation parameters.""")
-st.markdown("""There are 5 time periods ranging from -3 to 1. If a time period is negative or zero, then it is a pre-treatment period. 
-            Time period $t = 0$ marks the pre-treatment period used in the 2x2 DiD setup and $t = 1$ marks the post-treatment period.""")
+class SimParams(NamedTuple):
+    """Slider values passed to simulate(), used as the key for every cached helper.
 
-# Create 4 tabs as requested (combined simulation and visualization, plus data preview)
-simulation_viz_tab, results_tab, parallel_trends_tab, data_preview_tab = st.tabs(
-    [
-        "⚙️ Simulation Parameters & 📊 Visualizations",
-        "📋 Regression Results & Interpretation",
-        "🔍 Parallel Trends Testing",
-        "📊 Data Preview",
-    ]
-)
+    A NamedTuple rather than a dataclass: Streamlit hashes tuples of scalars
+    directly, while dataclasses go through dataclasses.asdict() first.
+    """
+
+    b0_treat: int
+    b0_control: int
+    b1_treat: int
+    b1_control: int
+    treatment_effect: int
+    noise: int
+    N: int
+    treat_ratio: float
+
+
+# Cached wrappers so reruns with unchanged slider values skip recomputation.
+# Every parameter-keyed cache is bounded by max_entries and also expires after
+# CACHE_TTL, so an idle long-lived server gives the memory back
+CACHE_TTL = "1h"
+
+
+@st.cache_data(show_spinner=False, max_entries=64, ttl=CACHE_TTL)
+def _simulate_cached(sim_params):
+    """Memoized wrapper around simulate(), keyed on the slider values."""
+    return simulate(**sim_params._asdict())
+
+
+@st.cache_resource(show_spinner=False, max_entries=32, ttl=CACHE_TTL)
+def _fit_all(sim_params):
+    """Fits the DiD and placebo regressions together in one memoized call.
+
+    The fitted results are cached by reference (no pickling) and keyed on the
+    simulation parameters, so they must not be mutated by the caller.
+
+    Parameters
+    ----------
+    sim_params : SimParams
+        Simulation parameters passed to _simulate_cached()
+
+    Returns
+    -------
+    tuple
+        (model_results, placebo_results) from estimate_did() and placebo_test()
+    """
+    df = _simulate_cached(sim_params)
+    return estimate_did(df), placebo_test(df)
+
+
+# The helpers below are keyed on the simulation parameters rather than on the
+# DataFrame itself, so a rerun never has to hash the simulated data.
+# Figures are held by reference: unpickling a go.Figure re-validates every
+# trace, which costs about as much as building the figure again
+@st.cache_resource(show_spinner=False, max_entries=64, ttl=CACHE_TTL)
+def _mean_outcomes_plot_cached(sim_params):
+    """Memoized mean_outcomes_plot() for the simulated data."""
+    fig = mean_outcomes_plot(_simulate_cached(sim_params))
+    # A constant uirevision lets Plotly.react diff new data into the existing
+    # chart (keeping zoom/legend state) instead of redrawing it from scratch
+    fig.update_layout(uirevision="mean_outcomes_plot")
+    return fig
+
+
+@st.cache_resource(show_spinner=False, max_entries=64, ttl=CACHE_TTL)
+def _means_plot_cached(sim_params):
+    """Memoized means_plot() for the fitted DiD regression."""
+    model_results, _ = _fit_all(sim_params)
+    fig = means_plot(model_results)
+    fig.update_layout(uirevision="means_plot")
+    return fig
+
+
+@st.cache_resource(show_spinner=False, max_entries=64, ttl=CACHE_TTL)
+def _bias_visualization_cached(sim_params):
+    """Memoized bias_visualization() for the fitted DiD regression.
+
+    Returns the same (fig, bias, estimated_effect, ci_lower, ci_upper) tuple,
+    shared by the visualization and results tabs.
+    """
+    model_results, _ = _fit_all(sim_params)
+    fig, *stats = bias_visualization(model_results, sim_params.treatment_effect)
+    fig.update_layout(uirevision="bias_visualization")
+    return fig, *stats
+
+
+@st.cache_data(show_spinner=False, max_entries=32, ttl=CACHE_TTL)
+def _monte_carlo_cached(sim_params, n_reps):
+    """Memoized monte_carlo_did() for the simulation parameters."""
+    return monte_carlo_did(n_reps=n_reps, **sim_params._asdict())
 
-# Combined Tab: Simulation Parameters & Visualizations
-with simulation_viz_tab:
-    st.caption(
-        "Play around with the sliders and see how the graphs and estimates change"
+
+@st.cache_resource(show_spinner=False, max_entries=32, ttl=CACHE_TTL)
+def _sampling_distribution_plot_cached(sim_params, n_reps):
+    """Memoized sampling_distribution_plot() for the Monte-Carlo replications."""
+    fig = sampling_distribution_plot(
+        _monte_carlo_cached(sim_params, n_reps), true_effect=sim_params.treatment_effect
     )
-    st.caption("e.g. Try making the group trends different and check the estimate!")
+    fig.update_layout(uirevision="sampling_distribution_plot")
+    return fig
+
+
+@st.cache_data(show_spinner=False, max_entries=64, ttl=CACHE_TTL)
+def _summary_texts(sim_params):
+    """Returns the plain-text regression summaries for the DiD and placebo fits."""
+    model_results, placebo_results = _fit_all(sim_params)
+    return model_results.summary().as_text(), placebo_results.summary().as_text()
+
+
+@st.cache_data(show_spinner=False, max_entries=64, ttl=CACHE_TTL)
+def _group_sizes(sim_params):
+    """Counts the treated and control units in the simulated data."""
+    df = _simulate_cached(sim_params)
+    units = df[df["time_period"] == 0]
+    n_treated = int(units["treat"].sum())
+    return n_treated, len(units) - n_treated
+
+
+@st.cache_data(show_spinner=False, max_entries=64, ttl=CACHE_TTL)
+def _preview(sim_params, n_rows=5):
+    """Returns the first few rows of the simulated data for the static preview table."""
+    df = _simulate_cached(sim_params)
+    return df.head(n_rows)[DISPLAY_COLUMNS].reset_index(drop=True)
+
 
-    # Create two main columns: parameters (left) and visualizations (right)
-    param_col, viz_col = st.columns([0.4, 0.6])
+@st.cache_data(show_spinner=False, max_entries=64, ttl=CACHE_TTL)
+def _df_to_csv_bytes(sim_params):
+    """Serializes the simulated data to UTF-8 CSV bytes once per parameter set.
 
-    # Left column: Simulation parameters
-    with param_col:
-        st.subheader("⚙️ Parameters")
+    Arrow's C++ CSV writer is several times faster than DataFrame.to_csv here.
+    """
+    df = _simulate_cached(sim_params)
+    table = pa.Table.from_pandas(df[DISPLAY_COLUMNS], preserve_index=False)
+    buffer = io.BytesIO()
+    pa_csv.write_csv(table, buffer)
+    return buffer.getvalue()
 
-        # Create two columns for better parameter organization
-        col1_params, col2_params = st.columns(2)
 
-        with col1_params:
-            true_effect = st.slider(
-                "True Effect",
+@st.cache_data(show_spinner=False, max_entries=64, ttl=CACHE_TTL)
+def _df_to_parquet_bytes(sim_params):
+    """Serializes the simulated data to Parquet bytes once per parameter set."""
+    df = _simulate_cached(sim_params)
+    return df[DISPLAY_COLUMNS].to_parquet(index=False, compression="snappy")
+
+
+# Slider definitions for the two parameter columns as (variable name, st.slider kwargs)
+PARAM_SLIDERS = (
+    (
+        (
+            "true_effect",
+            dict(
+                label="True Effect",
                 min_value=-50,
                 max_value=50,
                 value=8,
                 help="Size of the causal effect of the treatment",
-            )
-
-            treated_baseline = st.slider(
-                "Treated Baseline",
+            ),
+        ),
+        (
+            "treated_baseline",
+            dict(
+                label="Treated Baseline",
                 min_value=0,
                 max_value=50,
                 value=10,
                 help="Baseline outcome of the treated group at time t = 0",
-            )
-            treated_trend = st.slider(
-                "Treated Trend",
+            ),
+        ),
+        (
+            "treated_trend",
+            dict(
+                label="Treated Trend",
                 min_value=0,
                 max_value=10,
                 value=4,
                 help="The trend that the outcome of the treated group follows over time",
-            )
-            noise = st.slider(
-                "Noise",
+            ),
+        ),
+        (
+            "noise",
+            dict(
+                label="Noise",
                 min_value=0,
                 max_value=20,
                 value=3,
                 help="How much the variation in outcome can be",
-            )
-
-        with col2_params:
-            sample_size = st.slider(
-                "Sample Size",
+            ),
+        ),
+    ),
+    (
+        (
+            "sample_size",
+            dict(
+                label="Sample Size",
                 min_value=10,
                 max_value=2000,
                 value=200,
                 step=10,
                 help="The total number of units in the study",
-            )
-            control_baseline = st.slider(
-                "Control Baseline",
+            ),
+        ),
+        (
+            "control_baseline",
+            dict(
+                label="Control Baseline",
                 min_value=0,
                 max_value=50,
                 value=40,
                 help="Baseline outcome of the control group at time t = 0",
-            )
-            control_trend = st.slider(
-                "Control Trend",
+            ),
+        ),
+        (
+            "control_trend",
+            dict(
+                label="Control Trend",
                 min_value=0,
                 max_value=10,
                 value=4,
                 help="The trend that the outcome of the control group follows over time",
-            )
-
-            # New parameter for realistic treatment assignment
-            treat_ratio = st.slider(
-                "Treatment Group Size (%)",
+            ),
+        ),
+        # Realistic DiD designs often have uneven treatment assignment
+        (
+            "treat_ratio",
+            dict(
+                label="Treatment Group Size (%)",
                 min_value=10,
                 max_value=90,
                 value=30,
                 step=5,
                 help="Percentage of units in the treatment group (realistic DiD often has uneven groups)",
-            )
+            ),
+        ),
+    ),
+)
 
-    # Simulate data (needed for visualizations)
-    df = simulate(
-        b0_treat=treated_baseline,
-        b0_control=control_baseline,
-        b1_treat=treated_trend,
-        b1_control=control_trend,
-        treatment_effect=true_effect,
-        noise=noise,
-        N=sample_size,
-        treat_ratio=treat_ratio / 100,
-    )  # Convert percentage to decimal
-
-    # Get regression results for significance check
-    model_results = estimate_did(df)
-    p_value = model_results.pvalues["treat:time_indicator"]
-    is_significant = p_value < 0.05
-
-    # Right column: Visualizations
-    with viz_col:
-        st.subheader("📊 Visualizations")
-
-        # Display the mean outcomes plot
-        fig_mean = mean_outcomes_plot(df)
-        st.plotly_chart(fig_mean, use_container_width=True, key="mean_outcomes_plot")
-        st.caption(
-            "💡 **Note**: This shows group means over time. The raw data would vary around these points due to individual variation and noise."
-        )
 
-        # Display the means plot
-        fig_means = means_plot(model_results)
-        st.plotly_chart(fig_means, use_container_width=True, key="means_plot")
+def _param_sliders():
+    """Renders the simulation parameter sliders in two columns.
 
-        # Add bias visualization at the bottom
-        st.subheader("📈 Bias Visualization")
+    Returns
+    -------
+    dict
+        Slider values keyed by the variable names in PARAM_SLIDERS
+    """
+    slider_values = {}
+    # Create two columns for better parameter organization
+    for column, sliders in zip(st.columns(2), PARAM_SLIDERS):
+        with column:
+            for name, slider_kwargs in sliders:
+                slider_values[name] = st.slider(**slider_kwargs)
+    return slider_values
+
+
+# Set page config for this specific page
+setup_page(title="DiD Simulation Tool", icon="📈")
+
+# Back link (navigates client-side instead of rerunning this page first)
+st.page_link("Home.py", label="← Back to Home")
+
+st.title("Difference-in-Difference Simulation Tool 📈")
+
+# Introduction
+st.markdown("""Have you ever wanted to measure the impact of a policy or marketing campaign, but for some reason you couldn't run a 
+         traditional A/B test or randomized experiment? Or maybe you already launched the policy and need to understand the effects 
+         using observational data.
+
+The difference-in-difference design might be a good candidate for you to measure the impact of this policy. If this method is completely new to you, check out the DiD guide tab before using this tool. 
+         If you are already familiar with this method, feel free to skip over and start messing around with the simulation parameters.
+
+There are 5 time periods ranging from -3 to 1. If a time period is negative or zero, then it is a pre-treatment period. 
+            Time period $t = 0$ marks the pre-treatment period used in the 2x2 DiD setup and $t = 1$ marks the post-treatment period.""")
+
+
+# Everything driven by the sliders lives in a fragment so that moving a slider
+# only reruns this block instead of the whole page
+@st.fragment
+def _did_tool():
+    # Create 4 tabs as requested (combined simulation and visualization, plus data preview)
+    simulation_viz_tab, results_tab, parallel_trends_tab, data_preview_tab = st.tabs(
+        [
+            "⚙️ Simulation Parameters & 📊 Visualizations",
+            "📋 Regression Results & Interpretation",
+            "🔍 Parallel Trends Testing",
+            "📊 Data Preview",
+        ]
+    )
+
+    # Combined Tab: Simulation Parameters & Visualizations
+    with simulation_viz_tab:
         st.caption(
-            "Shows how far the model's estimated causal effect was from the true effect"
+            "Play around with the sliders and see how the graphs and estimates change"
         )
-        bias_fig, bias, estimated_effect, ci_lower, ci_upper = bias_visualization(
-            model_results, true_effect
+        st.caption("e.g. Try making the group trends different and check the estimate!")
+
+        # Create two main columns: parameters (left) and visualizations (right)
+        param_col, viz_col = st.columns([0.4, 0.6])
+
+        # Left column: Simulation parameters
+        with param_col:
+            st.subheader("⚙️ Parameters")
+
+            slider_values = _param_sliders()
+
+            true_effect = slider_values["true_effect"]
+            treated_baseline = slider_values["treated_baseline"]
+            treated_trend = slider_values["treated_trend"]
+            noise = slider_values["noise"]
+            sample_size = slider_values["sample_size"]
+            control_baseline = slider_values["control_baseline"]
+            control_trend = slider_values["control_trend"]
+            treat_ratio = slider_values["treat_ratio"]
+
+        # Simulation parameters, used as the cache key for the data, fits and figures
+        sim_params = SimParams(
+            b0_treat=treated_baseline,
+            b0_control=control_baseline,
+            b1_treat=treated_trend,
+            b1_control=control_trend,
+            treatment_effect=true_effect,
+            noise=noise,
+            N=sample_size,
+            treat_ratio=treat_ratio / 100,  # Convert percentage to decimal
         )
-        st.plotly_chart(bias_fig, use_container_width=True, key="bias_visualization")
 
-        # Show statistical significance feedback below bias visualization
-        if is_significant:
-            st.success(
-                "✅ **Statistically Significant Effect Detected** (p = {:.3f}): The estimated effect is statistically significantly different from 0. This does NOT mean there is a true effect. If parallel trends is violated, we can still find a significant effect when there is no true effect (false positive).".format(
-                    p_value
-                )
-            )
-        else:
-            st.warning(
-                "❌ **No Statistically Significant Effect** (p = {:.3f}): We don't have enough evidence to say that the estimated effect is significantly different from 0".format(
-                    p_value
-                )
-            )
+        # Get regression results for significance check
+        model_results, placebo_results = _fit_all(sim_params)
+        p_value = model_results.pvalues["treat:time_indicator"]
+        is_significant = p_value < 0.05
 
-# Tab 3: Regression Results and Interpretation
-with results_tab:
-    st.caption("Regression results and what they mean")
+        # Built once per parameter set and reused by the results tab below
+        bias_fig, bias, estimated_effect, ci_lower, ci_upper = (
+            _bias_visualization_cached(sim_params)
+        )
 
-    # Get bias visualization and statistics
-    bias_fig, bias, estimated_effect, ci_lower, ci_upper = bias_visualization(
-        model_results, true_effect
-    )
+        # Right column: Visualizations
+        with viz_col:
+            st.subheader("📊 Visualizations")
 
-    # Determine statistical significance
-    p_value = model_results.pvalues["treat:time_indicator"]
-    is_significant = p_value < 0.05
+            # Display the mean outcomes plot
+            fig_mean = _mean_outcomes_plot_cached(sim_params)
+            st.plotly_chart(fig_mean, use_container_width=True, key="mean_outcomes_plot")
+            st.caption(
+                "💡 **Note**: This shows group means over time. The raw data would vary around these points due to individual variation and noise."
+            )
 
-    # Create two columns for results and interpretation
-    col1_results, col2_results = st.columns([0.5, 0.5])
+            # Display the means plot
+            fig_means = _means_plot_cached(sim_params)
+            st.plotly_chart(fig_means, use_container_width=True, key="means_plot")
 
-    with col1_results:
-        st.subheader("📊 Regression Results")
-        st.write(model_results.summary())
+            # Add bias visualization at the bottom
+            st.subheader("📈 Bias Visualization")
+            st.caption(
+                "Shows how far the model's estimated causal effect was from the true effect"
+            )
+            st.plotly_chart(bias_fig, use_container_width=True, key="bias_visualization")
+
+            # Show statistical significance feedback below bias visualization
+            if is_significant:
+                st.success(
+                    "✅ **Statistically Significant Effect Detected** (p = {:.3f}): The estimated effect is statistically significantly different from 0. This does NOT mean there is a true effect. If parallel trends is violated, we can still find a significant effect when there is no true effect (false positive).".format(
+                        p_value
+                    )
+                )
+            else:
+                st.warning(
+                    "❌ **No Statistically Significant Effect** (p = {:.3f}): We don't have enough evidence to say that the estimated effect is significantly different from 0".format(
+                        p_value
+                    )
+                )
 
-    with col2_results:
-        st.subheader("🎯 Interpretation")
-        st.markdown(f"""
-        **Estimated Causal Effect**: {estimated_effect:.2f} units
+    # Tab 3: Regression Results and Interpretation
+    with results_tab:
+        st.caption("Regression results and what they mean")
+
+        # Create two columns for results and interpretation
+        col1_results, col2_results = st.columns([0.5, 0.5])
+
+        with col1_results:
+            st.subheader("📊 Regression Results")
+            # Headline numbers for the interaction term up front; the full
+            # statsmodels table is available on demand
+            coef_col, se_col, p_col = st.columns(3)
+            coef_col.metric("DiD Coefficient", f"{estimated_effect:.3f}")
+            se_col.metric(
+                "Std. Error (HC2)",
+                f"{model_results.bse['treat:time_indicator']:.3f}",
+            )
+            p_col.metric("P-value", f"{p_value:.3f}")
+            with st.expander("Full regression table"):
+                st.text(_summary_texts(sim_params)[0])
+
+        with col2_results:
+            st.subheader("🎯 Interpretation")
+            st.markdown(f"""
+            **Estimated Causal Effect**: {estimated_effect:.2f} units
+
+            **95% Confidence Interval**: [{ci_lower:.2f}, {ci_upper:.2f}]
+            """)
+
+            # Add confidence interval coverage info
+            ci_contains_true = ci_lower <= true_effect <= ci_upper
+            if ci_contains_true:
+                st.success("✅ **Confidence Interval**: Contains the true effect")
+            else:
+                st.error("❌ **Confidence Interval**: Does not contain the true effect")
+
+            # Add statistical significance interpretation
+            st.markdown(f"""
+            **Statistical Significance** (p = {p_value:.3f}):
+            """)
+
+            if is_significant:
+                st.success(
+                    "✅ **P-value Interpretation**: The estimated effect is statistically significantly different from 0. This does NOT mean there is a true effect. If parallel trends is violated, we can still find a signficant effect when there is no true effect (false postiive)."
+                )
+            else:
+                st.warning(
+                    "❌ **P-value Interpretation**: We don't have enough evidence to say that the estimated effect is significantly different from 0"
+                )
 
-        **95% Confidence Interval**: [{ci_lower:.2f}, {ci_upper:.2f}]
-        """)
+            st.markdown(f"""
+            **Bias**: The estimate is {abs(bias):.2f} units {"above" if bias > 0 else "below"} the true effect of {true_effect:.2f} units.
+            """)
 
-        # Add confidence interval coverage info
-        ci_contains_true = ci_lower <= true_effect <= ci_upper
-        if ci_contains_true:
-            st.success("✅ **Confidence Interval**: Contains the true effect")
-        else:
-            st.error("❌ **Confidence Interval**: Does not contain the true effect")
+        # Bias visualization below both columns
+        st.subheader("📈 Bias Visualization")
+        st.caption(
+            "Tells us how far the model's estimated causal effect was from the true effect"
+        )
+        st.plotly_chart(
+            bias_fig, use_container_width=True, key="results_bias_visualization"
+        )
 
-        # Add statistical significance interpretation
+        # Many replications show the estimator's behaviour, not just this draw
+        st.subheader("🎲 Sampling Distribution")
+        st.caption(
+            "Re-runs the simulation many times with the same parameters to show how much the estimate varies from sample to sample"
+        )
+        n_reps = st.slider(
+            "Replications",
+            min_value=100,
+            max_value=1000,
+            value=200,
+            step=100,
+            help="Number of simulated datasets to estimate the effect on",
+        )
+        mc_results = _monte_carlo_cached(sim_params, n_reps)
+        st.plotly_chart(
+            _sampling_distribution_plot_cached(sim_params, n_reps),
+            use_container_width=True,
+            key="sampling_distribution_plot",
+        )
         st.markdown(f"""
-        **Statistical Significance** (p = {p_value:.3f}):
+        **Average Estimate**: {mc_results["estimate"].mean():.2f} units (true effect: {true_effect:.2f})
         """)
-
-        if is_significant:
-            st.success(
-                "✅ **P-value Interpretation**: The estimated effect is statistically significantly different from 0. This does NOT mean there is a true effect. If parallel trends is violated, we can still find a signficant effect when there is no true effect (false postiive)."
-            )
+        if mc_results["std_err"].notna().all():
+            coverage = (
+                (mc_results["ci_lower"] <= true_effect)
+                & (true_effect <= mc_results["ci_upper"])
+            ).mean()
+            st.markdown(f"""
+            **CI Coverage**: {coverage:.1%} of the 95% confidence intervals contain the true effect
+            """)
         else:
-            st.warning(
-                "❌ **P-value Interpretation**: We don't have enough evidence to say that the estimated effect is significantly different from 0"
+            st.caption(
+                "CI coverage is not available: a group has a single unit, so its "
+                "variance (and the standard errors) cannot be estimated. Increase "
+                "the sample size or move the treated share away from the extremes."
             )
 
-        st.markdown(f"""
-        **Bias**: The estimate is {abs(bias):.2f} units {"above" if bias > 0 else "below"} the true effect of {true_effect:.2f} units.
-        """)
-
-    # Bias visualization below both columns
-    st.subheader("📈 Bias Visualization")
-    st.caption(
-        "Tells us how far the model's estimated causal effect was from the true effect"
-    )
-    st.plotly_chart(
-        bias_fig, use_container_width=True, key="results_bias_visualization"
-    )
-
-# Tab 4: Testing Parallel Trends Assumptions
-with parallel_trends_tab:
-    st.caption(
-        "DiD relies on the critical assumption of parallel trends. We need to check if this assumption is reasonable using a pre-treatment placebos test."
-    )
+    # Tab 4: Testing Parallel Trends Assumptions
+    with parallel_trends_tab:
+        st.caption(
+            "DiD relies on the critical assumption of parallel trends. We need to check if this assumption is reasonable using a pre-treatment placebos test."
+        )
 
-    st.write("""
-    This is a falsification test for the parallel trends. We run a 2x2 DiD using time periods -1 and 0 (before treatment) to test the parallel trends assumption. This is called a placebo test because we are pretending a treatment is applied between t = -1 and t = 0. 
+        st.write("""
+        This is a falsification test for the parallel trends. We run a 2x2 DiD using time periods -1 and 0 (before treatment) to test the parallel trends assumption. This is called a placebo test because we are pretending a treatment is applied between t = -1 and t = 0. 
     
-    If parallel trends hold, the interaction term (`treat:time_indicator`) should be close to zero and statistically insignificant. If the interaction term is non-zero and statistically significant, then we have evidence that the trends between the two groups were different and not parallel.
+        If parallel trends hold, the interaction term (`treat:time_indicator`) should be close to zero and statistically insignificant. If the interaction term is non-zero and statistically significant, then we have evidence that the trends between the two groups were different and not parallel.
              
-    This test has limitations. The argument that the groups were similar before treatment so they should be similar after is flawed.
-    There are many other methods to falsify this assumption. This one was used for simplicity.
-    """)
+        This test has limitations. The argument that the groups were similar before treatment so they should be similar after is flawed.
+        There are many other methods to falsify this assumption. This one was used for simplicity.
+        """)
 
-    placebo_results = placebo_test(df)
+        # Extract placebo test statistics
+        placebo_effect = placebo_results.params["treat:time_indicator"]
+        placebo_ci_lower, placebo_ci_upper = (
+            placebo_results.conf_int().loc["treat:time_indicator"].to_numpy()
+        )
+        placebo_pvalue = placebo_results.pvalues["treat:time_indicator"]
+        placebo_significant = placebo_pvalue < 0.05
 
-    # Extract placebo test statistics
-    placebo_effect = placebo_results.params["treat:time_indicator"]
-    placebo_ci_lower = placebo_results.conf_int().loc["treat:time_indicator", 0]
-    placebo_ci_upper = placebo_results.conf_int().loc["treat:time_indicator", 1]
-    placebo_pvalue = placebo_results.pvalues["treat:time_indicator"]
-    placebo_significant = placebo_pvalue < 0.05
+        # Create two columns for results and interpretation
+        col1_placebo, col2_placebo = st.columns([0.6, 0.4])
 
-    # Create two columns for results and interpretation
-    col1_placebo, col2_placebo = st.columns([0.6, 0.4])
+        with col1_placebo:
+            st.subheader("📊 Placebo Test Results")
+            st.text(_summary_texts(sim_params)[1])
 
-    with col1_placebo:
-        st.subheader("📊 Placebo Test Results")
-        st.write(placebo_results.summary())
+        with col2_placebo:
+            st.subheader("🎯 Interpretation")
+            st.markdown(f"""
+            **Placebo Effect**: {placebo_effect:.3f} units
 
-    with col2_placebo:
-        st.subheader("🎯 Interpretation")
-        st.markdown(f"""
-        **Placebo Effect**: {placebo_effect:.3f} units
+            **95% Confidence Interval**: [{placebo_ci_lower:.3f}, {placebo_ci_upper:.3f}]
 
-        **95% Confidence Interval**: [{placebo_ci_lower:.3f}, {placebo_ci_upper:.3f}]
+            **P-value**: {placebo_pvalue:.3f}
+            """)
 
-        **P-value**: {placebo_pvalue:.3f}
-        """)
+            # Assessment based on statistical significance
+            if placebo_significant:
+                st.error(
+                    "❌ **Assessment**: Trends diverged before treatment. Parallel trends assumption likely is not believable."
+                )
+                st.warning(
+                    "⚠️ **Implication**: This suggests the DiD estimate may be biased due to pre-existing differences in trends between groups."
+                )
+            else:
+                st.success(
+                    "✅ **Assessment**: Not enough evidence to claim there are different trends pre-treatment. Parallel trends assumption appears reasonable."
+                )
+                st.info(
+                    "💡 **Implication**: This makes the assumptions of the DiD design more reasonable, but does not completely validate the assumptions."
+                )
 
-        # Assessment based on statistical significance
-        if placebo_significant:
-            st.error(
-                "❌ **Assessment**: Trends diverged before treatment. Parallel trends assumption likely is not believable."
-            )
-            st.warning(
-                "⚠️ **Implication**: This suggests the DiD estimate may be biased due to pre-existing differences in trends between groups."
-            )
-        else:
-            st.success(
-                "✅ **Assessment**: Not enough evidence to claim there are different trends pre-treatment. Parallel trends assumption appears reasonable."
+    # Tab 4: Data Preview
+    with data_preview_tab:
+        st.header("📊 Data Preview")
+        st.caption("See what your simulated data looks like in tabular form")
+
+        # Show group sizes for educational purposes, counted from the data
+        # rather than re-derived from the sliders so the two can't disagree
+        n_treated, n_control = _group_sizes(sim_params)
+        st.markdown(
+            f"📈 **Group Sizes**: {n_treated} treated units ({treat_ratio}%) | {
+                n_control
+            } control units ({100 - treat_ratio}%)"
+        )
+
+        st.table(_preview(sim_params))
+
+        # Downloading doesn't change anything, so skip the rerun on click
+        csv_col, parquet_col, _ = st.columns([0.25, 0.25, 0.5])
+        with csv_col:
+            st.download_button(
+                "Download Data (CSV)",
+                data=_df_to_csv_bytes(sim_params),
+                file_name="simulated_did_data.csv",
+                mime="text/csv",
+                on_click="ignore",
+                type="primary",
+                use_container_width=True,
             )
-            st.info(
-                "💡 **Implication**: This makes the assumptions of the DiD design more reasonable, but does not completely validate the assumptions."
+        with parquet_col:
+            st.download_button(
+                "Download Data (Parquet)",
+                data=_df_to_parquet_bytes(sim_params),
+                file_name="simulated_did_data.parquet",
+                mime="application/vnd.apache.parquet",
+                on_click="ignore",
+                use_container_width=True,
             )
 
-# Tab 4: Data Preview
-with data_preview_tab:
-    st.header("📊 Data Preview")
-    st.caption("See what your simulated data looks like in tabular form")
-
-    # Show group sizes for educational purposes
-    n_treated = int(sample_size * treat_ratio / 100)
-    n_control = sample_size - n_treated
-    st.markdown(
-        f"📈 **Group Sizes**: {n_treated} treated units ({treat_ratio}%) | {
-            n_control
-        } control units ({100 - treat_ratio}%)"
-    )
 
-    df_display = df[["unit", "treat", "time_period", "outcome"]]
-    st.dataframe(df_display.head(5))
-    df_csv = df_display.to_csv()
-    st.download_button(
-        "Download Data", data=df_csv, file_name="simulated_did_data.csv", type="primary"
-    )
+_did_tool()
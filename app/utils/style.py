@@ -1,13 +1,26 @@
 import streamlit as st
 
+# Centers the page title and the caption directly under it (used by the homepage).
+# The bottom margin replaces separate empty spacer elements below the header.
+CENTERED_HEADER_CSS = """
+        h1, [data-testid="stCaptionContainer"] {
+            text-align: center;
+        }
+
+        [data-testid="stCaptionContainer"] {
+            margin-bottom: 2.5rem;
+        }
+"""
 
-def setup_page(title: str, icon: str):
+
+def setup_page(title: str, icon: str, center_header: bool = False):
     """
     Sets up the page configuration and injects custom CSS for fonts and styling.
 
     Args:
         title (str): The page title to display in the browser tab.
         icon (str): The favicon (emoji) to display in the browser tab.
+        center_header (bool): Whether to center the page title and caption.
     """
     st.set_page_config(page_title=title, page_icon=icon, layout="wide")
 
@@ -27,6 +40,9 @@ def setup_page(title: str, icon: str):
             font-family: 'Inter', sans-serif;
             font-weight: 700; /* Thicker headers */
         }
+        """
+        + (CENTERED_HEADER_CSS if center_header else "")
+        + """
         </style>
         """,
         unsafe_allow_html=True,
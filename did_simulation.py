@@ -25,42 +25,43 @@ import statsmodels.formula.api as smf
 # %%
 # function that simulates panel data
 # N = number of people we are observing over time
-def simulate(b0_treat = 10, b0_control = 40, b1_treat = 4, b1_control = 4, treatment_effect = 8, noise = 3, N = 500, R = 100):
+def simulate(b0_treat = 10, b0_control = 40, b1_treat = 4, b1_control = 4, treatment_effect = 8, noise = 3, N = 500, R = 100, *, rng):
     # simulate data
 
+    # draws come from the numpy Generator (PCG64) passed in by the caller,
+    # e.g. the seeded rng from the setup cell, so every call is reproducible
+
     # units and treatment assignment
     units = np.arange(N)
     treat = np.repeat([0, 1], np.floor(N/2)) 
-    np.random.shuffle(treat)
+    rng.shuffle(treat)
+
+    # time periods from -3 to 1, one row per unit and period: unit-level
+    # values are repeated and periods tiled (the layout a cross merge produces)
+    time_periods = np.arange(-3, 2)
+    n_periods = len(time_periods)
 
     df = pd.DataFrame({
-        'unit' : units,
-        'treat' : treat
+        'unit' : np.repeat(units, n_periods),
+        'treat' : np.repeat(treat, n_periods),
+        'time_period' : np.tile(time_periods, N)
     })
 
-    # time periods from -3 to 1
-    df = df.merge(pd.DataFrame({'time_period' : np.arange(-3, 2)}), how = 'cross')
-
     # add time indicator (1 if post-treatment else 0)
     df['time_indicator'] = (df['time_period'] == 1).astype(int)
 
-    # add outcomes
-
-    # baseline outcomes
-    df['outcome'] = df['treat'].apply(lambda x : b0_treat if x == 1 else b0_control) 
-
-    # apply trends
-    treat_mask = df['treat'] == 1 
-    control_mask = df['treat'] == 0
-
-    df.loc[treat_mask, 'outcome'] += df.loc[treat_mask, 'time_period'] * b1_treat
-    df.loc[control_mask, 'outcome'] += df.loc[control_mask, 'time_period'] * b1_control
-
-    # apply treatment effect
-    df['outcome'] = df['outcome'] + treatment_effect * df['treat'] * df['time_indicator']
-
-    # add noise
-    df['outcome'] = df['outcome'] + np.random.normal(0, noise, 5*N)
+    # add outcomes: baseline, group trend, treatment effect and noise in one
+    # vectorized expression on the underlying arrays
+    treat_col = df['treat'].to_numpy()
+    time_col = df['time_period'].to_numpy()
+    is_treated = treat_col == 1
+
+    df['outcome'] = (
+        np.where(is_treated, b0_treat, b0_control)
+        + time_col * np.where(is_treated, b1_treat, b1_control)
+        + treatment_effect * treat_col * df['time_indicator'].to_numpy()
+        + rng.normal(0, noise, 5*N)
+    )
 
     return df        
 
@@ -68,8 +69,9 @@ def simulate(b0_treat = 10, b0_control = 40, b1_treat = 4, b1_control = 4, treat
 # %%
 # function that plots simulated panel data
 def panel_plot(df):
-    df_plot = df.copy()
-    df_plot['treat'] = df_plot['treat'].apply(lambda x : 'Treated' if x == 1 else 'Control')
+    df_plot = df[['time_period', 'outcome']].assign(
+        treat = np.where(df['treat'].to_numpy() == 1, 'Treated', 'Control')
+    )
 
     # create scatterplot
     fig = px.scatter(
@@ -88,7 +90,9 @@ def panel_plot(df):
             'Treated': 'red',
             'Control': 'blue'
         },
-        template='plotly_white'
+        template='plotly_white',
+        # WebGL keeps large panels responsive; SVG is fine for a few thousand points
+        render_mode='webgl' if len(df_plot) > 5000 else 'svg'
     )
 
     # Add the vertical line for when the treatment occurs
@@ -107,10 +111,10 @@ def panel_plot(df):
 
 # %%
 # set default parameters
-np.random.seed(42)
+rng = np.random.default_rng(42)
 
 # %%
-df = simulate(b0_treat = 20, b0_control = 10, b1_treat = 4, b1_control = 4, treatment_effect = -50, noise = 0)
+df = simulate(b0_treat = 20, b0_control = 10, b1_treat = 4, b1_control = 4, treatment_effect = -50, noise = 0, rng = rng)
 
 # %%
 panel_plot(df)
@@ -121,7 +125,8 @@ panel_plot(df)
 
 # %%
 def estimate(df):
-    filtered_df = df[df['time_period'].isin([0, 1])].copy()
+    time_period = df['time_period'].to_numpy()
+    filtered_df = df.loc[(time_period == 0) | (time_period == 1), ['outcome', 'treat', 'time_indicator']]
     model = smf.ols('outcome~treat*time_indicator', data = filtered_df)
     results = model.fit(cov_type = 'HC2')
     
@@ -193,7 +198,7 @@ def means_plot(model_results):
 # %%
 def placebo_test(df):
     # Filter to pre-treatment data
-    pre_treatment_df = df[df['time_period'] <= 0].copy()
+    pre_treatment_df = df.loc[df['time_period'] <= 0, ['outcome', 'treat', 'time_period']]
 
     # Fit model
     model = smf.ols('outcome~treat*time_period', data = pre_treatment_df)
@@ -203,7 +208,7 @@ def placebo_test(df):
 
 
 # %%
-test_df = simulate()
+test_df = simulate(rng = rng)
 print(test_df.shape)
 
 panel_plot(test_df)
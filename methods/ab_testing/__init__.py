@@ -1,10 +1,12 @@
 from .ab_testing import (
     calculate_sample_size,
+    calculate_sample_size_curve,
     calculate_test_length
 )
 
 __all__ = [
     'calculate_sample_size',
+    'calculate_sample_size_curve',
     'calculate_test_length'
 ]
 
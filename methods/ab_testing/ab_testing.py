@@ -1,7 +1,58 @@
+from functools import lru_cache
+
 from scipy.stats import norm
 import numpy as np
 
 
+@lru_cache(maxsize=256)
+def _z_scores(alpha: float, power: float) -> tuple[float, float]:
+    """Returns the two-sided critical value for alpha and the one for power.
+    Memoized because norm.ppf has a noticeable per-call overhead and the same
+    few (alpha, power) pairs come up again and again"""
+    return float(norm.ppf(1 - alpha / 2)), float(norm.ppf(power))
+
+
+def _sample_sizes(alpha, power, delta, variance, ratio) -> tuple[np.ndarray, np.ndarray]:
+    """Validates the inputs and computes the per-group sample sizes, each rounded up.
+    Every argument may be a scalar or an array; arrays broadcast against each other
+    following NumPy rules
+
+    Returns:
+    (n_control, n_treated) : tuple of np.ndarray
+        Float arrays of whole numbers (0-d when every input is a scalar)
+    """
+    alpha, power, delta, variance, ratio = (
+        np.asarray(x, dtype=float) for x in (alpha, power, delta, variance, ratio)
+    )
+
+    # alpha = 0 and power = 0 or 1 put the critical values at +/- infinity
+    if np.any((alpha <= 0) | (alpha > 1)):
+        raise Exception("Alpha must be between 0 and 1 (not including 0)")
+
+    if np.any((power <= 0) | (power >= 1)):
+        raise Exception("Power must be between 0 and 1 (not including 0 or 1)")
+
+    if np.any(delta == 0):
+        raise Exception("Delta must not be 0")
+
+    if np.any(variance < 0):
+        raise Exception("Variance must be greater than or equal to 0")
+
+    if np.any((ratio <= 0) | (ratio >= 1)):
+        raise Exception("Ratio must be between 0 and 1 (not including 0 or 1)")
+
+    if alpha.ndim == 0 and power.ndim == 0:
+        Z_ALPHA, Z_POWER = _z_scores(float(alpha), float(power))
+    else:
+        Z_ALPHA, Z_POWER = norm.ppf(1 - alpha / 2), norm.ppf(power)
+
+    n_total = ((Z_ALPHA + Z_POWER) ** 2 * variance) / (ratio * (1 - ratio) * delta**2)
+    n_treated = np.ceil(n_total * ratio)
+    n_control = np.ceil(n_total - n_treated)
+
+    return n_control, n_treated
+
+
 def calculate_sample_size(
     alpha: float, power: float, delta: float, variance: float, ratio: float
 ) -> dict[str, int]:
@@ -9,13 +60,13 @@ def calculate_sample_size(
     Parameters:
     ----------
     alpha : float
-        The significiance threshold of the experiment. Between 0 and 1
+        The significiance threshold of the experiment. Between 0 (exclusive) and 1
     power : float
-        The desired power of the experiment. Between 0 and 1
+        The desired power of the experiment. Between 0 and 1 (exclusive)
     delta : float
         The desired effect size that you want to detect in the experiment. Please specify an absolute effect size.
         E.g. if the control group's conversion rate is 0.10 and the treated group's is 0.15, delta = 0.05.
-        DO NOT put the relative effect size (0.5)
+        DO NOT put the relative effect size (0.5). Must not be 0
     variance : float
         The variance of the metric in your population. Must be greater than or equal to 0
     ratio : float
@@ -28,24 +79,8 @@ def calculate_sample_size(
             "n_treated" : number of treated units needed
             "n_total" : number of total units needed
     """
-    if alpha < 0 or alpha > 1:
-        raise Exception("Alpha must be between 0 and 1")
-
-    if power < 0 or power > 1:
-        raise Exception("Power must be between 0 and 1")
-
-    if variance < 0:
-        raise Exception("Variance must be greater than or equal to 0")
-
-    if ratio <= 0 or ratio >= 1:
-        raise Exception("Ratio must be between 0 and 1 (not including 0 or 1)")
-
-    Z_ALPHA = norm.ppf(1 - alpha / 2)
-    Z_POWER = norm.ppf(power)
-
-    n_total = ((Z_ALPHA + Z_POWER) ** 2 * variance) / (ratio * (1 - ratio) * delta**2)
-    n_treated = int(np.ceil(n_total * ratio))
-    n_control = int(np.ceil(n_total - n_treated))
+    n_control, n_treated = _sample_sizes(alpha, power, delta, variance, ratio)
+    n_control, n_treated = int(n_control), int(n_treated)
     n_total_new = int(
         n_treated + n_control
     )  # to make sure rounded up n_treated + n_control = n_total
@@ -55,6 +90,33 @@ def calculate_sample_size(
     return res
 
 
+def calculate_sample_size_curve(
+    alpha: float, power: float, deltas: np.ndarray, variance: float, ratio: float
+) -> np.ndarray:
+    """Calculates the total sample size for a range of effect sizes in one pass
+    Parameters:
+    ----------
+    alpha : float
+        The significiance threshold of the experiment. Between 0 (exclusive) and 1
+    power : float
+        The desired power of the experiment. Between 0 and 1 (exclusive)
+    deltas : np.ndarray
+        The absolute effect sizes to evaluate. None may be 0
+    variance : float
+        The variance of the metric in your population. Must be greater than or equal to 0
+    ratio : float
+        The ratio of treated to untreated units. (e.g. 0.9 means 90% are treated, 10% are control)
+
+    Returns:
+    n_total : np.ndarray
+        The total number of units needed for each delta, rounded up per group
+        exactly as in calculate_sample_size
+    """
+    n_control, n_treated = _sample_sizes(alpha, power, deltas, variance, ratio)
+
+    return (n_treated + n_control).astype(int)
+
+
 def calculate_test_length(traffic: int, total_sample_size: int) -> int:
     """Calculate the number of days needed to run an A/B test experiment.
 
@@ -9,19 +9,23 @@ from .did import (
     simulate,
     estimate_did,
     placebo_test,
+    monte_carlo_did,
     panel_plot,
     mean_outcomes_plot,
     means_plot,
-    bias_visualization
+    bias_visualization,
+    sampling_distribution_plot
 )
 
 __all__ = [
     'simulate',
     'estimate_did',
     'placebo_test',
+    'monte_carlo_did',
     'panel_plot',
     'mean_outcomes_plot',
     'means_plot',
-    'bias_visualization'
+    'bias_visualization',
+    'sampling_distribution_plot'
 ]
 
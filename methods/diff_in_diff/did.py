@@ -9,16 +9,23 @@ This module contains all functions related to DiD analysis including:
 
 import numpy as np
 import pandas as pd
-import statsmodels.formula.api as smf
 import plotly.express as px
 import plotly.graph_objects as go
+import plotly.io as pio
+
+# statsmodels is imported inside the estimation functions: it accounts for most
+# of this module's import time and is not needed for simulation or plotting
+
+# Two-sided 95% critical value, norm.ppf(0.975). statsmodels uses normal
+# (not t) critical values for robust covariance types such as HC2
+_Z_95 = 1.959963984540054
 
 
 # ============================================
 # SIMULATION FUNCTIONS
 # ============================================
 
-def simulate(b0_treat=10, b0_control=40, b1_treat=4, b1_control=4, treatment_effect=8, noise=3, N=500, treat_ratio=0.3):
+def simulate(b0_treat=10, b0_control=40, b1_treat=4, b1_control=4, treatment_effect=8, noise=3, N=500, treat_ratio=0.3, seed=1):
     """
     Simulates panel data for a Difference-in-Differences setup.
     
@@ -40,6 +47,8 @@ def simulate(b0_treat=10, b0_control=40, b1_treat=4, b1_control=4, treatment_eff
         Total number of units in the study
     treat_ratio : float
         Proportion of units in the treatment group (between 0 and 1)
+    seed : int
+        Seed for the random number generator
     
     Returns
     -------
@@ -48,73 +57,64 @@ def simulate(b0_treat=10, b0_control=40, b1_treat=4, b1_control=4, treatment_eff
         unit_baseline_effect, time_effect, outcome
     """
     # simulate data
-    np.random.seed(1)  # for reproducibility
+    rng = np.random.default_rng(seed)  # for reproducibility
 
     # units and treatment assignment with realistic proportions
-    units = np.arange(N)
-    n_treated = int(N * treat_ratio)  # e.g., 30% treated
+    units = np.arange(N, dtype=np.int32)
+    # Rounded to 9 decimals before truncating: 90 * 0.7 is 62.999... in floating point
+    n_treated = int(round(N * treat_ratio, 9))  # e.g., 30% treated
     n_control = N - n_treated         # e.g., 70% control
     
     treat = np.concatenate([np.ones(n_treated), np.zeros(n_control)])
-    np.random.shuffle(treat)
+    rng.shuffle(treat)  # Currently, treatment status to units is randomly assigned
 
-    # Currently, treatment status to units is randomly assigned
-    df = pd.DataFrame({
-        'unit': units,
-        'treat': treat
-    })
+    # Build the long panel (one row per unit and time period) directly from
+    # arrays: unit-level values are repeated and period-level values are tiled
+
+    # time periods from -3 to 1 (small integer dtypes keep the panel compact)
+    time_periods = np.arange(-3, 2, dtype=np.int8)
+    n_periods = len(time_periods)
 
-    # time periods from -3 to 1
-    df = df.merge(pd.DataFrame({'time_period': np.arange(-3, 2)}), how='cross')
+    unit_col = np.repeat(units, n_periods)
+    treat_col = np.repeat(treat, n_periods)
+    time_col = np.tile(time_periods, N)
 
     # add time indicator (1 if post-treatment else 0)
-    df['time_indicator'] = (df['time_period'] == 1).astype(int)
+    time_indicator = (time_col == 1).astype(np.int8)
 
     # add outcomes
 
     # Add unit-level baseline heterogeneity
-    unit_baseline_effects = np.random.normal(0, 2, N)  # Individual baseline differences
-    
-    # Create unit-level effects dataframe
-    unit_effects = pd.DataFrame({
-        'unit': units,
-        'unit_baseline_effect': unit_baseline_effects
-    })
-    
-    # Merge unit effects with main dataframe
-    df = df.merge(unit_effects, on='unit')
-
-    # baseline outcomes with unit heterogeneity
-    df['outcome'] = df['treat'].apply(lambda x: b0_treat if x == 1 else b0_control) 
-    df['outcome'] = df['outcome'] + df['unit_baseline_effect']  # Add individual baseline variation
-
-    # apply trends
-    treat_mask = df['treat'] == 1 
-    control_mask = df['treat'] == 0
-
-    df.loc[treat_mask, 'outcome'] += df.loc[treat_mask, 'time_period'] * b1_treat
-    df.loc[control_mask, 'outcome'] += df.loc[control_mask, 'time_period'] * b1_control
+    unit_baseline_effects = rng.normal(0, 2, N)  # Individual baseline differences
+    unit_baseline_col = np.repeat(unit_baseline_effects, n_periods)
 
     # Add time-varying confounders (affect all units equally)
-    time_effects = np.random.normal(0, 2.5, 5)  # One effect per time period (-3, -2, -1, 0, 1)
-    
-    # Create time effects dataframe
-    time_effects_df = pd.DataFrame({
-        'time_period': [-3, -2, -1, 0, 1],
-        'time_effect': time_effects
-    })
-    
-    # Merge time effects with main dataframe
-    df = df.merge(time_effects_df, on='time_period')
-    
-    # Apply time-varying confounders to all units
-    df['outcome'] = df['outcome'] + df['time_effect']
-
-    # apply treatment effect
-    df['outcome'] = df['outcome'] + treatment_effect * df['treat'] * df['time_indicator']
+    time_effects = rng.normal(0, 2.5, n_periods)  # One effect per time period (-3, -2, -1, 0, 1)
+    time_effect_col = np.tile(time_effects, N)
+
+    # baseline outcomes with unit heterogeneity, group trends, time-varying
+    # confounders and the treatment effect
+    is_treated = treat_col == 1
+    outcome = (
+        np.where(is_treated, b0_treat, b0_control)
+        + unit_baseline_col
+        + time_col * np.where(is_treated, b1_treat, b1_control)
+        + time_effect_col
+        + treatment_effect * treat_col * time_indicator
+    )
 
     # add noise
-    df['outcome'] = df['outcome'] + np.random.normal(0, noise, 5*N)
+    outcome = outcome + rng.normal(0, noise, n_periods * N)
+
+    df = pd.DataFrame({
+        'unit': unit_col,
+        'treat': treat_col,
+        'time_period': time_col,
+        'time_indicator': time_indicator,
+        'unit_baseline_effect': unit_baseline_col,
+        'outcome': outcome,
+        'time_effect': time_effect_col
+    })
 
     return df
 
@@ -137,10 +137,10 @@ def estimate_did(df):
     statsmodels.regression.linear_model.RegressionResultsWrapper
         Regression results with the DiD estimate as the coefficient on treat:time_indicator
     """
-    filtered_df = df[df['time_period'].isin([0, 1])].copy()
-    model = smf.ols('outcome~treat*time_indicator', data=filtered_df)
-    results = model.fit(cov_type='HC2')
-    
+    time_period = df['time_period'].to_numpy()
+    filtered_df = df.loc[(time_period == 0) | (time_period == 1), ['outcome', 'treat', 'time_indicator']]
+    results = _fit_2x2(filtered_df, filtered_df['time_indicator'])
+
     return results
 
 
@@ -162,15 +162,117 @@ def placebo_test(df):
     statsmodels.regression.linear_model.RegressionResultsWrapper
         Regression results with the placebo effect as the coefficient on treat:time_indicator
     """
-    filtered_df = df[df['time_period'].isin([-1, 0])].copy()
-    filtered_df['time_indicator'] = filtered_df['time_period'].apply(lambda x: 1 if x == 0 else 0)
-
-    model = smf.ols('outcome~treat*time_indicator', data=filtered_df)
-    results = model.fit(cov_type='HC2')
+    time_period = df['time_period'].to_numpy()
+    filtered_df = df.loc[(time_period == -1) | (time_period == 0), ['outcome', 'treat', 'time_period']]
+    results = _fit_2x2(filtered_df, filtered_df['time_period'] == 0)
 
     return results
 
 
+def _fit_2x2(df, post):
+    """
+    Fits outcome ~ treat * time_indicator with HC2 standard errors.
+
+    The design matrix is built directly with the same column names the formula
+    'outcome~treat*time_indicator' would produce, so the results (params,
+    conf_int, summary) are identical but skip patsy's formula parsing.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        Panel data restricted to the two periods, with columns: outcome, treat
+    post : pd.Series
+        1 (or True) for the post period rows of df, 0 otherwise
+
+    Returns
+    -------
+    statsmodels.regression.linear_model.RegressionResultsWrapper
+        Regression results with the DiD estimate as the coefficient on treat:time_indicator
+    """
+    import statsmodels.api as sm
+
+    treat = df['treat'].to_numpy(dtype=float)
+    time_indicator = np.asarray(post, dtype=float)
+    exog = pd.DataFrame({
+        'Intercept': np.ones(len(df)),
+        'treat': treat,
+        'time_indicator': time_indicator,
+        'treat:time_indicator': treat * time_indicator
+    }, index=df.index)
+
+    return sm.OLS(df['outcome'], exog).fit(cov_type='HC2')
+
+
+def monte_carlo_did(n_reps=200, b0_treat=10, b0_control=40, b1_treat=4, b1_control=4, treatment_effect=8, noise=3, N=500, treat_ratio=0.3, seed=1):
+    """
+    Repeats the simulation many times and computes the 2x2 DiD estimate for each draw.
+
+    Each replication draws new unit effects, time effects and noise for time
+    periods 0 and 1 (the only periods the 2x2 DiD uses). All replications are
+    computed at once with NumPy: in the saturated 2x2 model the DiD coefficient
+    is the difference of the four cell means and its HC2 variance is the sum of
+    the cell variances over the cell sizes, so no regression has to be fitted.
+    
+    Parameters
+    ----------
+    n_reps : int
+        Number of simulated datasets
+    b0_treat, b0_control, b1_treat, b1_control, treatment_effect, noise, N, treat_ratio
+        Same as simulate()
+    seed : int
+        Seed for the random number generator
+    
+    Returns
+    -------
+    pd.DataFrame
+        One row per replication with columns: estimate, std_err, ci_lower, ci_upper
+        (std_err and the CI are NaN when a group has a single unit)
+    """
+    rng = np.random.default_rng(seed)
+
+    n_treated = int(round(N * treat_ratio, 9))
+
+    # Units are exchangeable, so the first n_treated units are the treated group
+    is_treated = np.arange(N) < n_treated
+    periods = np.array([0, 1])
+
+    # (N, 2) expected outcome for each unit in periods 0 and 1
+    expected = (
+        np.where(is_treated, b0_treat, b0_control)[:, None]
+        + periods * np.where(is_treated, b1_treat, b1_control)[:, None]
+        + treatment_effect * (is_treated[:, None] & (periods == 1))
+    )
+
+    # (n_reps, N, 2) outcomes, built in place to keep peak memory down
+    outcome = rng.normal(0, noise, (n_reps, N, 2))
+    outcome += expected
+    outcome += rng.normal(0, 2, (n_reps, N, 1))    # unit baseline effects
+    outcome += rng.normal(0, 2.5, (n_reps, 1, 2))  # time effects
+
+    treated, control = outcome[:, :n_treated], outcome[:, n_treated:]
+    treated_means, control_means = treated.mean(axis=1), control.mean(axis=1)
+
+    estimate = (
+        (treated_means[:, 1] - treated_means[:, 0])
+        - (control_means[:, 1] - control_means[:, 0])
+    )
+    if n_treated < 2 or N - n_treated < 2:
+        # A single-unit group has no within-group variance to estimate
+        std_err = np.full(n_reps, np.nan)
+    else:
+        std_err = np.sqrt(
+            treated.var(axis=1, ddof=1).sum(axis=1) / n_treated
+            + control.var(axis=1, ddof=1).sum(axis=1) / (N - n_treated)
+        )
+
+    return pd.DataFrame({
+        'estimate': estimate,
+        'std_err': std_err,
+        'ci_lower': estimate - _Z_95 * std_err,
+        'ci_upper': estimate + _Z_95 * std_err
+    })
+
+
 # ============================================
 # VISUALIZATION FUNCTIONS
 # ============================================
@@ -189,10 +291,12 @@ def panel_plot(df):
     plotly.graph_objects.Figure
         Interactive scatter plot with treatment line marker
     """
-    df_plot = df.copy()
-    df_plot['treat'] = df_plot['treat'].apply(lambda x: 'Treated' if x == 1 else 'Control')
+    # Only the plotted columns are copied, and labels are mapped in one pass
+    df_plot = df[['time_period', 'outcome']].assign(
+        treat=np.where(df['treat'] == 1, 'Treated', 'Control')
+    )
 
-    # create scatterplot
+    # create scatterplot (WebGL, since this draws every unit-period row)
     fig = px.scatter(
         df_plot,
         x='time_period',
@@ -209,7 +313,10 @@ def panel_plot(df):
             'Treated': 'red',
             'Control': 'blue'
         },
-        template='plotly_white'
+        template='plotly_white',
+        # WebGL keeps large panels responsive; SVG is fine for a few thousand points
+        # and avoids using up one of the browser's limited WebGL contexts
+        render_mode='webgl' if len(df_plot) > 5000 else 'svg'
     )
 
     # Add the vertical line for when the treatment occurs
@@ -243,13 +350,23 @@ def mean_outcomes_plot(df):
     plotly.graph_objects.Figure
         Interactive line plot with treatment line marker
     """
-    # Compute mean outcomes by group and time period
-    mean_df = (
-        df.groupby(["treat", "time_period"])['outcome']
-          .mean()
-          .reset_index()
-    )
-    mean_df['Group'] = mean_df['treat'].map({1: 'Treated', 0: 'Control'})
+    # Compute mean outcomes by group and time period. There are only a handful
+    # of cells, so each row gets a flat cell code (group-major, periods sorted
+    # as groupby would) and the means come from two np.bincount passes
+    is_treated = df['treat'].to_numpy() == 1
+    periods, period_codes = np.unique(df['time_period'].to_numpy(), return_inverse=True)
+    n_periods = len(periods)
+    codes = is_treated * n_periods + period_codes
+
+    sums = np.bincount(codes, weights=df['outcome'].to_numpy(), minlength=2 * n_periods)
+    counts = np.bincount(codes, minlength=2 * n_periods)
+    observed = counts > 0  # groupby only returns cells that have rows
+
+    mean_df = pd.DataFrame({
+        'time_period': np.tile(periods, 2)[observed],
+        'outcome': sums[observed] / counts[observed],
+        'Group': np.repeat(['Control', 'Treated'], n_periods)[observed]
+    })
     
     # Create line plot with markers
     fig = px.line(
@@ -327,66 +444,54 @@ def means_plot(model_results):
     treat_post = b0+b1+b2+b3
     treat_counterfactual = b0+b1+b2
 
-    fig = go.Figure()
-    fig.add_trace(go.Scatter(
-        x=[0, 1],
-        y=[control_pre, control_post],
-        mode='lines+markers',
-        line=dict(color='blue', width=2),
-        name='Control',
-        showlegend=True
-    ))
-    fig.add_trace(go.Scatter(
-        x=[0, 1],
-        y=[treat_pre, treat_post],
-        mode='lines+markers',
-        line=dict(color='red', width=2),
-        name='Treated',
-        showlegend=True
-    ))
-    fig.add_trace(go.Scatter(
-        x=[0, 1],
-        y=[treat_pre, treat_counterfactual],
-        mode='lines+markers',
-        line=dict(color='red', width=2, dash='dash'),
-        name='Treated (Counterfactual)',
-        showlegend=True
-    ))
-
-    # Add the vertical line for when the treatment occurs (without annotation text)
-    fig.add_vline(
-        x=0.5,
-        line_dash="dash",
-        line_color="black"
-    )
-    
-    # Add a dummy trace for treatment start in legend
-    fig.add_trace(go.Scatter(
-        x=[None, None],
-        y=[None, None],
-        mode='lines',
-        line=dict(color='black', width=2, dash='dash'),
-        name='Treatment Start',
-        showlegend=True,
-        hoverinfo='skip'
-    ))
-    
-    # Fix 1: Add explicit height and better margins
-    fig.update_layout(
-        title="DiD Regression Visualization",
-        xaxis_title="Time Period",
-        yaxis_title="Outcome",
-        legend_title_text='',
-        template='plotly_white',
-        height=400,
-        margin=dict(l=50, r=50, t=100, b=50)
-    )
-
-    # Fix 2: Force horizontal x-axis labels
-    fig.update_xaxes(
-        tickvals=[0, 1],
-        tickangle=0
-    )
+    def line(y, name, color, dash=None):
+        return dict(
+            type='scatter',
+            x=[0, 1],
+            y=y,
+            mode='lines+markers',
+            line=dict(color=color, width=2, dash=dash) if dash else dict(color=color, width=2),
+            name=name,
+            showlegend=True
+        )
+
+    # The figure is assembled as plain dicts and handed to go.Figure without
+    # validation: every value here is a known-good literal, and validating the
+    # traces and the template is most of the cost of building this figure
+    fig = go.Figure(dict(
+        data=[
+            line([control_pre, control_post], 'Control', 'blue'),
+            line([treat_pre, treat_post], 'Treated', 'red'),
+            line([treat_pre, treat_counterfactual], 'Treated (Counterfactual)', 'red', dash='dash'),
+            # Dummy trace for treatment start in legend
+            dict(
+                type='scatter',
+                x=[None, None],
+                y=[None, None],
+                mode='lines',
+                line=dict(color='black', width=2, dash='dash'),
+                name='Treatment Start',
+                showlegend=True,
+                hoverinfo='skip'
+            )
+        ],
+        layout=dict(
+            # Vertical line for when the treatment occurs (without annotation text)
+            shapes=[dict(
+                type='line',
+                x0=0.5, x1=0.5, xref='x',
+                y0=0, y1=1, yref='y domain',
+                line=dict(color='black', dash='dash')
+            )],
+            title=dict(text="DiD Regression Visualization"),
+            xaxis=dict(title=dict(text="Time Period"), tickvals=[0, 1], tickangle=0),
+            yaxis=dict(title=dict(text="Outcome")),
+            legend=dict(title=dict(text='')),
+            template=pio.templates['plotly_white'],
+            height=400,
+            margin=dict(l=50, r=50, t=100, b=50)
+        )
+    ), _validate=False)
 
     return fig
 
@@ -415,56 +520,117 @@ def bias_visualization(model_results, true_effect):
         - ci_lower is the lower bound of 95% CI
         - ci_upper is the upper bound of 95% CI
     """
-    # Extract the treatment effect estimate and confidence interval
+    # Extract the treatment effect estimate and its 95% confidence interval
+    # (the same bounds conf_int() gives, computed for this term only). Robust
+    # fits such as estimate_did()'s use normal critical values, others use t
     estimated_effect = model_results.params['treat:time_indicator']
-    ci_lower = model_results.conf_int().loc['treat:time_indicator', 0]
-    ci_upper = model_results.conf_int().loc['treat:time_indicator', 1]
+    std_err = model_results.bse['treat:time_indicator']
+    if model_results.use_t:
+        from scipy.stats import t
+        crit = t.ppf(0.975, model_results.df_resid)
+    else:
+        crit = _Z_95
+    ci_lower = estimated_effect - crit * std_err
+    ci_upper = estimated_effect + crit * std_err
     
     # Calculate bias
     bias = estimated_effect - true_effect
     
-    # Create the visualization
-    fig = go.Figure()
+    # Create the visualization from plain dicts and NumPy arrays, without
+    # validation (see means_plot)
+    fig = go.Figure(dict(
+        data=[
+            # Estimated effect point
+            dict(
+                type='scatter',
+                x=np.array([0.0]),
+                y=np.array([estimated_effect]),
+                mode='markers',
+                marker=dict(size=12, color='red'),
+                name=f'Estimated Effect: {estimated_effect:.2f}',
+                showlegend=True
+            ),
+            # Confidence interval as a filled area
+            dict(
+                type='scatter',
+                x=np.array([0.0, 0.0]),
+                y=np.array([ci_lower, ci_upper]),
+                mode='lines',
+                line=dict(color='red', width=3),
+                fill='tonexty',
+                fillcolor='rgba(255, 0, 0, 0.2)',
+                name=f'95% CI: [{ci_lower:.2f}, {ci_upper:.2f}]',
+                showlegend=True
+            )
+        ],
+        layout=dict(
+            # True effect line, with its label at the top right
+            shapes=[dict(
+                type='line',
+                x0=0, x1=1, xref='x domain',
+                y0=true_effect, y1=true_effect, yref='y',
+                line=dict(color='green', dash='dash')
+            )],
+            annotations=[dict(
+                text=f"True Effect: {true_effect:.2f}",
+                showarrow=False,
+                x=1, xref='x domain', xanchor='right',
+                y=true_effect, yref='y', yanchor='bottom'
+            )],
+            title=dict(text="Estimated vs True Treatment Effect"),
+            xaxis=dict(title=dict(text=""), showticklabels=False, range=[-0.5, 0.5]),
+            yaxis=dict(title=dict(text="Treatment Effect")),
+            template=pio.templates['plotly_white'],
+            height=400
+        )
+    ), _validate=False)
+    
+    return fig, bias, estimated_effect, ci_lower, ci_upper
+
+
+def sampling_distribution_plot(mc_df, true_effect):
+    """
+    Creates a histogram of the DiD estimates from monte_carlo_did().
+    
+    Parameters
+    ----------
+    mc_df : pd.DataFrame
+        Results from monte_carlo_did() function
+    true_effect : float
+        The true treatment effect used in simulation
     
-    # Add true effect line
-    fig.add_hline(
-        y=true_effect,
+    Returns
+    -------
+    plotly.graph_objects.Figure
+        Histogram of the estimates with the true and mean estimated effects marked
+    """
+    fig = px.histogram(
+        mc_df,
+        x='estimate',
+        nbins=40,
+        labels={'estimate': 'Estimated Effect'},
+        template='plotly_white',
+        title="Sampling Distribution of the DiD Estimate"
+    )
+
+    fig.add_vline(
+        x=true_effect,
         line_dash="dash",
         line_color="green",
         annotation_text=f"True Effect: {true_effect:.2f}",
         annotation_position="top right"
     )
-    
-    # Add estimated effect point
-    fig.add_trace(go.Scatter(
-        x=[0],
-        y=[estimated_effect],
-        mode='markers',
-        marker=dict(size=12, color='red'),
-        name=f'Estimated Effect: {estimated_effect:.2f}',
-        showlegend=True
-    ))
-    
-    # Add confidence interval as a filled area
-    fig.add_trace(go.Scatter(
-        x=[0, 0],
-        y=[ci_lower, ci_upper],
-        mode='lines',
-        line=dict(color='red', width=3),
-        fill='tonexty',
-        fillcolor='rgba(255, 0, 0, 0.2)',
-        name=f'95% CI: [{ci_lower:.2f}, {ci_upper:.2f}]',
-        showlegend=True
-    ))
-    
+    fig.add_vline(
+        x=mc_df['estimate'].mean(),
+        line_color="red",
+        annotation_text=f"Mean Estimate: {mc_df['estimate'].mean():.2f}",
+        annotation_position="top left"
+    )
+
     fig.update_layout(
-        title="Estimated vs True Treatment Effect",
-        xaxis_title="",
-        yaxis_title="Treatment Effect",
-        template='plotly_white',
-        xaxis=dict(showticklabels=False, range=[-0.5, 0.5]),
-        height=400
+        yaxis_title="Replications",
+        height=400,
+        margin=dict(l=50, r=50, t=100, b=50)
     )
-    
-    return fig, bias, estimated_effect, ci_lower, ci_upper
 
+    return fig